@@ -1,7 +1,10 @@
-import speech_recognition as sr
-from gtts import gTTS
-import os
-from datetime import datetime
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import scrolledtext
 
@@ -13,53 +16,147 @@ root.geometry("800x500")
 conversation_box = scrolledtext.ScrolledText(root, wrap=tk.WORD, font=("Arial", 14))
 conversation_box.pack(expand=True, fill="both")
 
+def append_message(message):
+    conversation_box.insert(tk.END, message)
+    conversation_box.see(tk.END)
+
+# Questions are handled on a worker thread, which never calls Tk itself; it
+# queues what to do and the main loop drains the queue
+ui_events = queue.Queue()
+
+def show(message):
+    ui_events.put(("message", message))
+
+def process_ui_events():
+    while True:
+        try:
+            kind, value = ui_events.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "message":
+            append_message(value)
+        elif kind == "error":
+            root.report_callback_exception(*value)
+        elif kind == "done":
+            listen_button.config(state=tk.NORMAL)
+    root.after(50, process_ui_events)
+
+# Speech input is created on the first question so the window shows up
+# without waiting on PortAudio, then reused so the energy threshold keeps
+# adapting and the microphone isn't re-probed on every click
+recognizer = None
+microphone = None
+
+# One worker per language tried on each question
+recognition_pool = ThreadPoolExecutor(max_workers=2)
+
+def get_speech_input():
+    global recognizer, microphone
+    if microphone is None:
+        import speech_recognition as sr
+        # Only keep the pair once both exist, so a missing input device just
+        # fails this click and the next one tries again
+        r = sr.Recognizer()
+        mic = sr.Microphone()
+        recognizer, microphone = r, mic
+    return recognizer, microphone
+
 def listen_and_recognize():
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        conversation_box.insert(tk.END, "\n? Listening...\n")
-        conversation_box.see(tk.END)
-        root.update()
+    r, mic = get_speech_input()
+    with mic as source:
+        show("\n? Listening...\n")
         audio = r.listen(source)
 
+    # Send both languages at once so an English question doesn't wait for
+    # the Malayalam attempt to fail first; Malayalam still wins when it matches
+    malayalam = recognition_pool.submit(r.recognize_google, audio, language="ml-IN")
+    english = recognition_pool.submit(r.recognize_google, audio, language="en-IN")
+
     try:
-        text = r.recognize_google(audio, language="ml-IN")
-        conversation_box.insert(tk.END, f"\n? [Malayalam]: {text}\n")
-        conversation_box.see(tk.END)
+        text = malayalam.result()
+        show(f"\n? [Malayalam]: {text}\n")
         return text, "ml"
     except:
         try:
-            text = r.recognize_google(audio, language="en-IN")
-            conversation_box.insert(tk.END, f"\n? [English]: {text}\n")
-            conversation_box.see(tk.END)
+            text = english.result()
+            show(f"\n? [English]: {text}\n")
             return text, "en"
         except Exception as e:
-            conversation_box.insert(tk.END, f"\n? Could not understand: {e}\n")
-            conversation_box.see(tk.END)
+            show(f"\n? Could not understand: {e}\n")
             return None, None
 
+# Looked up once instead of searching PATH for every response
+MPG123 = shutil.which("mpg123")
+
+# Recently spoken MP3s, so repeating a response skips the gTTS round trip
+SPEECH_CACHE_SIZE = 64
+speech_cache = OrderedDict()
+
+def synthesize(response, lang):
+    # Responses that differ only in spacing sound the same, so share an entry
+    response = " ".join(response.split())
+    key = (response, lang)
+    if key in speech_cache:
+        speech_cache.move_to_end(key)
+        yield speech_cache[key]
+        return
+
+    from gtts import gTTS
+    parts = []
+    # lang is always "ml" or "en", so skip gTTS rebuilding its language table
+    for part in gTTS(text=response, lang=lang, lang_check=False).stream():
+        parts.append(part)
+        yield part
+    speech_cache[key] = b"".join(parts)
+    if len(speech_cache) > SPEECH_CACHE_SIZE:
+        speech_cache.popitem(last=False)
+
 def speak_and_display(response, lang):
-    conversation_box.insert(tk.END, f"? [{lang.upper()}]: {response}\n")
-    conversation_box.see(tk.END)
-    root.update()
+    show(f"? [{lang.upper()}]: {response}\n")
 
-    tts = gTTS(text=response, lang=lang)
-    filename = f"response_{datetime.now().timestamp()}.mp3"
-    tts.save(filename)
-    os.system(f"mpg123 -q {filename}")
-    os.remove(filename)
+    # mpg123 reads the MP3 from stdin and starts playing the first chunk
+    # while gTTS is still fetching the rest of a long response
+    if MPG123 is None:
+        show("? mpg123 is not installed, cannot play the response\n")
+        return
+    player = subprocess.Popen([MPG123, "-q", "-"], stdin=subprocess.PIPE)
+    try:
+        for chunk in synthesize(response, lang):
+            # The buffered pipe writes the whole chunk; flush so mpg123 gets it now
+            player.stdin.write(chunk)
+            player.stdin.flush()
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            player.stdin.close()
+        except BrokenPipeError:
+            pass
+        player.wait()
+
+# The robot repeats the question back, phrased per language
+REPLY_PREFIXES = {"ml": "You've said: ", "en": "You said: "}
 
 def run_assistant():
-    query, lang = listen_and_recognize()
-    if query:
-        if lang == "ml":
-            response = "You've said: " + query
-        else:
-            response = "You said: " + query
-        speak_and_display(response, lang)
+    try:
+        query, lang = listen_and_recognize()
+        if query:
+            speak_and_display(REPLY_PREFIXES[lang] + query, lang)
+    except Exception:
+        ui_events.put(("error", sys.exc_info()))
+    finally:
+        ui_events.put(("done", None))
+
+def ask_question():
+    # Listening, recognition and playback all block, so run them on a worker
+    # thread and keep the window responsive; one question at a time
+    listen_button.config(state=tk.DISABLED)
+    threading.Thread(target=run_assistant, daemon=True).start()
 
 # Button to trigger listening
-listen_button = tk.Button(root, text="? Ask a Question", font=("Arial", 16), command=run_assistant)
+listen_button = tk.Button(root, text="? Ask a Question", font=("Arial", 16), command=ask_question)
 listen_button.pack(pady=10)
 
 # Run GUI
+process_ui_events()
 root.mainloop()
\ No newline at end of file